@@ -6,14 +6,161 @@ A simple app for designing knitting patterns on a grid.
 
 import tkinter as tk
 import json
-import os
 import colorsys
 import math
+import sys
+import base64
+import zlib
+from array import array
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson  # Optional faster JSON codec
+except ImportError:
+    orjson = None
+
+# Settings and project files live next to this script
+SETTINGS_PATH = Path(__file__).with_name("knitting_settings.json")
+PROJECT_PATH = Path(__file__).with_name("knitting_project.json")
+MARK_RGB = bytes.fromhex("ff0000")  # Color of the X marks on completed stitches
+GRID_LINE_RGB = bytes.fromhex("4a4a4a")  # Color of the lines between tiles, along each tile's top and left edge
+MAX_PALETTE_SIZE = 0x10000  # Tiles store palette ids in array("H"), so ids must fit in 16 bits
+HEX_PAIRS = tuple(f"{i:02x}" for i in range(256))  # Two-digit hex of each channel value
+
+
+def dump_json(obj):
+    """Serialize to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def load_json(data):
+    """Parse JSON from bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def pack_bytes(data):
+    """Compress binary data into base64 text that can be stored in JSON."""
+    return base64.b64encode(zlib.compress(data)).decode("ascii")
+
+
+def unpack_bytes(text):
+    """Get back the binary data stored by pack_bytes."""
+    return zlib.decompress(base64.b64decode(text))
+
+
+def hue_to_rgb(hue):
+    """Get the RGB bytes of a hue at full saturation and value."""
+    # Same sector formulas as colorsys.hsv_to_rgb with s = v = 1
+    sector = int(hue * 6.0)
+    f = (hue * 6.0) - sector
+    q = int((1.0 - f) * 255)
+    t = int((1.0 - (1.0 - f)) * 255)
+    sector %= 6
+    if sector == 0:
+        return bytes((255, t, 0))
+    if sector == 1:
+        return bytes((q, 255, 0))
+    if sector == 2:
+        return bytes((0, 255, t))
+    if sector == 3:
+        return bytes((0, q, 255))
+    if sector == 4:
+        return bytes((t, 0, 255))
+    return bytes((255, 0, q))
+
+
+def hsv_to_rgb(hue, sat, val):
+    """Convert HSV floats in [0, 1] to an (r, g, b) tuple of 0-255 ints."""
+    # Same sector formulas as colorsys.hsv_to_rgb, scaled to 0-255 and truncated
+    if sat == 0.0:
+        v = int(val * 255)
+        return v, v, v
+    sector = int(hue * 6.0)
+    f = (hue * 6.0) - sector
+    v = int(val * 255)
+    p = int(val * (1.0 - sat) * 255)
+    q = int(val * (1.0 - sat * f) * 255)
+    t = int(val * (1.0 - sat * (1.0 - f)) * 255)
+    sector %= 6
+    if sector == 0:
+        return v, t, p
+    if sector == 1:
+        return q, v, p
+    if sector == 2:
+        return p, v, t
+    if sector == 3:
+        return p, q, v
+    if sector == 4:
+        return t, p, v
+    return v, p, q
+
+
+@lru_cache(maxsize=None)
+def value_tables(size):
+    """Get per-row byte translation tables that scale a channel by that row's value in an SV square."""
+    tables = []
+    for y in range(size):
+        val = 1.0 - (y / size)
+        tables.append(bytes(int(i * val) for i in range(256)))
+    return tables
+
+
+@lru_cache(maxsize=None)
+def mark_pixels(tile_size):
+    """Get, for each pixel row of a tile, the columns covered by the X mark at that tile size."""
+    # Same geometry as the two canvas lines the X used to be drawn with
+    padding = max(2, tile_size // 6)
+    reach = max(2, tile_size // 20) / 2 * math.sqrt(2)  # Half the line width, along an axis
+    length = tile_size - 2 * padding
+    rows = []
+    for y in range(tile_size):
+        cy = y + 0.5 - padding
+        cols = []
+        for x in range(tile_size):
+            cx = x + 0.5 - padding
+            # Close enough to a diagonal, and between that diagonal's end points
+            if ((abs(cx - cy) <= reach and 0 <= cx + cy <= 2 * length)
+                    or (abs(cx + cy - length) <= reach and abs(cy - cx) <= length)):
+                cols.append(x)
+        rows.append(tuple(cols))
+    return tuple(rows)
+
+
+@lru_cache(maxsize=None)
+def header_labels(count):
+    """Get the 1-based header labels for a grid with the given number of rows/columns."""
+    return tuple(str(i + 1) for i in range(count))
+
+
+@lru_cache(maxsize=64)
+def sv_square_ppm(hue, size):
+    """Build the saturation/value square for a hue as PPM data."""
+    # The top row has full value; saturation increases left to right
+    top_row = bytearray()
+    for x in range(size):
+        top_row += bytes(hsv_to_rgb(hue, x / size, 1.0))
+    top_row = bytes(top_row)
+
+    # Every other row is the top row scaled by its value, one translate call per row
+    data = bytearray(b"P6 %d %d 255\n" % (size, size))
+    for table in value_tables(size):
+        data += top_row.translate(table)
+    return bytes(data)
 
 
 class ModernColorPicker(tk.Toplevel):
     """A modern color picker with HSV wheel, saturation/value square, and hex input."""
 
+    # Wheel PPM data by (wheel_size, wheel_inner_radius). The wheel never changes, so it is
+    # built once per process; bytes are cached since PhotoImages belong to one Tk interpreter.
+    _wheel_cache = {}
+
     def __init__(self, parent, initial_color="#ffffff", title="Choose Color", recent_colors=None):
         super().__init__(parent)
         self.title(title)
@@ -37,9 +184,15 @@ class ModernColorPicker(tk.Toplevel):
         self.wheel_inner_radius = self.wheel_radius - 25
         self.sv_size = 150
 
+        # Drag updates waiting to be drawn once Tk is idle
+        self.refresh_id = None
+        self.sv_dirty = False
+        self.preview_hex = None  # Color the preview currently shows
+
         self._setup_ui()
         self._draw_color_wheel()
         self._draw_sv_square()
+        self._create_indicators()
         self._update_indicators()
 
         # Center on parent
@@ -92,6 +245,8 @@ class ModernColorPicker(tk.Toplevel):
             highlightthickness=0
         )
         self.sv_canvas.pack()
+        self.sv_image = tk.PhotoImage(width=self.sv_size, height=self.sv_size)  # Redrawn in place on hue change
+        self.sv_canvas.create_image(0, 0, image=self.sv_image, anchor=tk.NW)
         self.sv_canvas.bind("<Button-1>", self._on_sv_click)
         self.sv_canvas.bind("<B1-Motion>", self._on_sv_click)
 
@@ -111,6 +266,7 @@ class ModernColorPicker(tk.Toplevel):
         tk.Label(preview_frame, text="New", fg="#888888", bg="#2d2d2d", font=("Arial", 8)).pack(pady=(5, 0))
         self.new_preview = tk.Canvas(preview_frame, width=50, height=30, highlightthickness=1, highlightbackground="#555555")
         self.new_preview.pack()
+        self.new_preview_rect = self.new_preview.create_rectangle(0, 0, 50, 30, fill=self.initial_color, outline="")
 
         # Hex input
         input_frame = tk.Frame(middle_frame, bg="#2d2d2d")
@@ -157,10 +313,10 @@ class ModernColorPicker(tk.Toplevel):
             colors_row.pack(fill=tk.X, pady=(5, 0))
 
             for color in self.recent_colors[:10]:
-                btn = tk.Canvas(colors_row, width=20, height=20, highlightthickness=1, highlightbackground="#555555", cursor="hand2")
-                btn.pack(side=tk.LEFT, padx=2)
-                btn.create_rectangle(0, 0, 20, 20, fill=color, outline="")
-                btn.bind("<Button-1>", lambda e, c=color: self._select_recent(c))
+                swatch = tk.Frame(colors_row, width=20, height=20, bg=color, highlightthickness=1, highlightbackground="#555555", cursor="hand2")
+                swatch.pack(side=tk.LEFT, padx=2)
+                swatch.color = color  # Read back by the shared click handler
+                swatch.bind("<Button-1>", self._on_recent_click)
 
         # Buttons
         btn_frame = tk.Frame(main_frame, bg="#2d2d2d")
@@ -196,110 +352,101 @@ class ModernColorPicker(tk.Toplevel):
 
     def _draw_color_wheel(self):
         """Draw the hue wheel."""
-        self.wheel_image = tk.PhotoImage(width=self.wheel_size, height=self.wheel_size)
-        cx, cy = self.wheel_radius, self.wheel_radius
-
-        for y in range(self.wheel_size):
-            row_colors = []
-            for x in range(self.wheel_size):
-                dx = x - cx
-                dy = y - cy
-                dist = math.sqrt(dx*dx + dy*dy)
-
-                if self.wheel_inner_radius <= dist <= self.wheel_radius:
-                    angle = math.atan2(dy, dx)
-                    hue = (angle + math.pi) / (2 * math.pi)
-                    r, g, b = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-                    color = f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
-                    row_colors.append(color)
-                else:
-                    row_colors.append("#2d2d2d")
-
-            self.wheel_image.put("{" + " ".join(row_colors) + "}", to=(0, y))
+        key = (self.wheel_size, self.wheel_inner_radius)
+        data = self._wheel_cache.get(key)
+        if data is None:
+            data = self._wheel_cache[key] = self._build_color_wheel()
 
+        self.wheel_image = tk.PhotoImage(data=data)
         self.wheel_canvas.create_image(0, 0, image=self.wheel_image, anchor=tk.NW)
 
+    def _build_color_wheel(self):
+        """Build the hue wheel as PPM data."""
+        size = self.wheel_size
+        cx, cy = self.wheel_radius, self.wheel_radius
+        # Compare squared distances so no square root is needed per pixel
+        inner_sq = self.wheel_inner_radius ** 2
+        outer_sq = self.wheel_radius ** 2
+        background = bytes.fromhex("2d2d2d") * size
+
+        # Build the wheel as one binary PPM rather than a color string per pixel
+        data = bytearray(b"P6 %d %d 255\n" % (size, size))
+        for y in range(size):
+            dy = y - cy
+            row = bytearray(background)
+            for x in range(size):
+                dx = x - cx
+                if inner_sq <= dx*dx + dy*dy <= outer_sq:
+                    hue = (math.atan2(dy, dx) + math.pi) / (2 * math.pi)
+                    row[3*x:3*x + 3] = hue_to_rgb(hue)
+            data += row
+        return bytes(data)
+
     def _draw_sv_square(self):
         """Draw the saturation/value square for current hue."""
-        self.sv_image = tk.PhotoImage(width=self.sv_size, height=self.sv_size)
-
-        for y in range(self.sv_size):
-            row_colors = []
-            val = 1.0 - (y / self.sv_size)
-            for x in range(self.sv_size):
-                sat = x / self.sv_size
-                r, g, b = colorsys.hsv_to_rgb(self.current_hue, sat, val)
-                color = f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
-                row_colors.append(color)
-            self.sv_image.put("{" + " ".join(row_colors) + "}", to=(0, y))
-
-        self.sv_canvas.delete("all")
-        self.sv_canvas.create_image(0, 0, image=self.sv_image, anchor=tk.NW)
+        self.sv_image.put(sv_square_ppm(self.current_hue, self.sv_size), to=(0, 0))
+
+    def _create_indicators(self):
+        """Create the position indicators on wheel and SV square, moved by _update_indicators."""
+        self.wheel_indicator_ids = (
+            self.wheel_canvas.create_oval(0, 0, 0, 0, outline="#ffffff", width=2, tags="indicator"),
+            self.wheel_canvas.create_oval(0, 0, 0, 0, outline="#000000", width=1, tags="indicator")
+        )
+        self.sv_indicator_id = self.sv_canvas.create_oval(0, 0, 0, 0, width=2, tags="indicator")
 
     def _update_indicators(self):
         """Update the position indicators on wheel and SV square."""
         # Wheel indicator
-        self.wheel_canvas.delete("indicator")
         angle = self.current_hue * 2 * math.pi - math.pi
         mid_radius = (self.wheel_inner_radius + self.wheel_radius) / 2
         ix = self.wheel_radius + mid_radius * math.cos(angle)
         iy = self.wheel_radius + mid_radius * math.sin(angle)
 
-        self.wheel_canvas.create_oval(
-            ix - 6, iy - 6, ix + 6, iy + 6,
-            outline="#ffffff", width=2, tags="indicator"
-        )
-        self.wheel_canvas.create_oval(
-            ix - 5, iy - 5, ix + 5, iy + 5,
-            outline="#000000", width=1, tags="indicator"
-        )
+        outer_id, inner_id = self.wheel_indicator_ids
+        self.wheel_canvas.coords(outer_id, ix - 6, iy - 6, ix + 6, iy + 6)
+        self.wheel_canvas.coords(inner_id, ix - 5, iy - 5, ix + 5, iy + 5)
 
         # SV indicator
-        self.sv_canvas.delete("indicator")
         sx = self.current_sat * self.sv_size
         sy = (1.0 - self.current_val) * self.sv_size
 
         # Use contrasting color for indicator
         indicator_color = "#ffffff" if self.current_val < 0.5 else "#000000"
-        self.sv_canvas.create_oval(
-            sx - 6, sy - 6, sx + 6, sy + 6,
-            outline=indicator_color, width=2, tags="indicator"
-        )
+        self.sv_canvas.coords(self.sv_indicator_id, sx - 6, sy - 6, sx + 6, sy + 6)
+        self.sv_canvas.itemconfig(self.sv_indicator_id, outline=indicator_color)
 
     def _update_preview(self):
         """Update the color preview and hex display."""
-        hex_color = self._get_hex()
-        self.new_preview.delete("all")
-        self.new_preview.create_rectangle(0, 0, 50, 30, fill=hex_color, outline="")
+        r, g, b = self._get_rgb()
+        hex_color = "#" + HEX_PAIRS[r] + HEX_PAIRS[g] + HEX_PAIRS[b]
 
-        # Update hex entry
+        # Update hex entry, even for the same color, in case it holds text that was never applied
         self.hex_var.set(hex_color[1:])
 
+        if hex_color == self.preview_hex:
+            return  # Small drags often land on the same color
+        self.preview_hex = hex_color
+
+        self.new_preview.itemconfig(self.new_preview_rect, fill=hex_color)
+
         # Update RGB label
-        r, g, b = self._get_rgb()
         self.rgb_label.config(text=f"R: {r}  G: {g}  B: {b}")
 
     def _get_rgb(self):
         """Get current color as RGB tuple."""
-        r, g, b = colorsys.hsv_to_rgb(self.current_hue, self.current_sat, self.current_val)
-        return int(r * 255), int(g * 255), int(b * 255)
+        return hsv_to_rgb(self.current_hue, self.current_sat, self.current_val)
 
     def _get_hex(self):
         """Get current color as hex string."""
         r, g, b = self._get_rgb()
-        return f"#{r:02x}{g:02x}{b:02x}"
+        return "#" + HEX_PAIRS[r] + HEX_PAIRS[g] + HEX_PAIRS[b]
 
     def _set_color_from_hex(self, hex_color):
         """Set HSV values from hex color."""
         hex_color = hex_color.lstrip("#")
         if len(hex_color) == 6:
-            r = int(hex_color[0:2], 16) / 255
-            g = int(hex_color[2:4], 16) / 255
-            b = int(hex_color[4:6], 16) / 255
-            h, s, v = colorsys.rgb_to_hsv(r, g, b)
-            self.current_hue = h
-            self.current_sat = s
-            self.current_val = v
+            r, g, b = bytes.fromhex(hex_color)
+            self.current_hue, self.current_sat, self.current_val = colorsys.rgb_to_hsv(r / 255, g / 255, b / 255)
 
     def _on_wheel_click(self, event):
         """Handle click on color wheel."""
@@ -311,9 +458,8 @@ class ModernColorPicker(tk.Toplevel):
         if self.wheel_inner_radius <= dist <= self.wheel_radius:
             angle = math.atan2(dy, dx)
             self.current_hue = (angle + math.pi) / (2 * math.pi)
-            self._draw_sv_square()
-            self._update_indicators()
-            self._update_preview()
+            self.sv_dirty = True
+            self._schedule_refresh()
 
     def _on_sv_click(self, event):
         """Handle click on SV square."""
@@ -323,6 +469,19 @@ class ModernColorPicker(tk.Toplevel):
         self.current_sat = x / self.sv_size
         self.current_val = 1.0 - (y / self.sv_size)
 
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        """Redraw once Tk is idle, so a burst of motion events only draws the latest color."""
+        if self.refresh_id is None:
+            self.refresh_id = self.after_idle(self._refresh)
+
+    def _refresh(self):
+        """Draw the changes queued by wheel and SV square events."""
+        self.refresh_id = None
+        if self.sv_dirty:
+            self.sv_dirty = False
+            self._draw_sv_square()
         self._update_indicators()
         self._update_preview()
 
@@ -331,7 +490,6 @@ class ModernColorPicker(tk.Toplevel):
         hex_val = self.hex_var.get().strip().lstrip("#")
         if len(hex_val) == 6:
             try:
-                int(hex_val, 16)
                 self._set_color_from_hex(hex_val)
                 self._draw_sv_square()
                 self._update_indicators()
@@ -339,6 +497,10 @@ class ModernColorPicker(tk.Toplevel):
             except ValueError:
                 pass
 
+    def _on_recent_click(self, event):
+        """Select the color of the clicked recent color swatch."""
+        self._select_recent(event.widget.color)
+
     def _select_recent(self, color):
         """Select a color from recent colors."""
         self._set_color_from_hex(color)
@@ -356,6 +518,13 @@ class ModernColorPicker(tk.Toplevel):
         self.result = None
         self.destroy()
 
+    def destroy(self):
+        """Cancel any pending redraw before the window goes away."""
+        if self.refresh_id is not None:
+            self.after_cancel(self.refresh_id)
+            self.refresh_id = None
+        super().destroy()
+
     @staticmethod
     def ask_color(parent, initial_color="#ffffff", title="Choose Color", recent_colors=None):
         """Static method to show picker and get result."""
@@ -376,42 +545,78 @@ class KnittingDesigner:
         self.min_tile_size = 50
         self.max_tile_size = 200
         self.max_colors = 15
+        self.view_margin = 4  # Tiles rendered beyond each edge of the visible area
+        self._update_tile_edges()
 
         # State
         self.selected_color_index = 0
         self.colors = ["#ffffff"] * self.max_colors
         self.colors[0] = "#3a6ea5"  # Default first color
-        self.grid_data = [["#f5f5f5" for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+        # Tiles store ids into the palette, a table of every color in use; id 0 is the empty tile color
+        self.palette = ["#f5f5f5"]
+        self.palette_ids = {"#f5f5f5": 0}
+        self.palette_rgb = [bytes.fromhex("f5f5f5")]  # Raw RGB bytes per palette id, for rendering
+        self.tile_images = {}  # Maps palette id to a one-tile image of that color at the current tile size
+        self.tile_rows = []  # RGB bytes of a pixel row below a tile's top grid line per palette id, at the current tile size
+        self.marked_tile_rows = {}  # Maps palette id to the RGB bytes of each pixel row of a marked tile
+        self.marked_tile_images = {}  # Maps palette id to a one-tile image of that color with an X mark
+        self.color_ids = []  # Palette id of each color slot
+        self._update_color_ids()
+        self.grid_data = [array("H", [0]) * self.grid_size for _ in range(self.grid_size)]
         self.color_buttons = []
+        self.highlighted_index = -1  # Color button currently drawn as selected
 
         # Track mouse state for dragging
         self.is_dragging = False
-        self.current_stroke = []  # Tiles painted in current stroke
-
-        # Undo history
-        self.undo_history = []
+        self.current_stroke = {}  # Maps (row, col) to the palette id it had before the current stroke
+        self.last_tile = None  # Last tile the current stroke was drawn up to
+        self.drag_tile = None  # Latest tile under the pointer, handled once Tk is idle
+        self.drag_flush_id = None
+
+        # Changes waiting to be drawn into the grid image once Tk is idle: painted tiles, and
+        # a block (min_row, min_col, max_row, max_col, exclusive max) covering bulk changes
+        self.pending_tiles = set()
+        self.dirty_block = None
+        self.flush_scheduled = False
+
+        # Undo history (oldest strokes drop off the end once full). Each entry is a snapshot
+        # (min_row, min_col, rows of old palette ids) of the smallest block one stroke changed.
         self.max_undo = 50
+        self.undo_history = deque(maxlen=self.max_undo)
 
         # Recent colors for color picker
-        self.recent_colors = []
         self.max_recent_colors = 10
+        self.recent_colors = deque(maxlen=self.max_recent_colors)  # Newest first
+
+        # Pending delayed settings write (after id), so bursts of edits are written once
+        self.save_settings_id = None
+        self.project_dirty = True  # Whether tiles or marks changed since the project was loaded or saved
+        self.project_file_stamp = None  # (mtime_ns, size) of the project file when it was last loaded or saved
 
         # Selection state
         self.selection_start = None
         self.selection_end = None
-        self.selection_rect_id = None
+        self.selection_rect_id = None  # Canvas ids of the (outer, main, inner) selection rectangles
+        self.selection_redraw_id = None  # Pending throttled redraw of the selection while dragging
         self.is_selecting = False
-        self.clipboard = None  # Stores copied/cut data as 2D list of colors
+        self.clipboard = None  # Stores copied/cut data as a list of rows of palette ids
 
         # Mark mode state (for tracking completed stitches)
         self.mark_mode = False
-        self.marked_tiles = set()  # Set of (row, col) tuples
-        self.mark_ids = {}  # Maps (row, col) to canvas item IDs for the X marks
+        # One byte per tile, 1 if the tile is marked; marks are drawn into the grid image
+        self.marked_rows = [bytearray(self.grid_size) for _ in range(self.grid_size)]
 
         self.setup_ui()
         self.load_settings()
         self.load_project()
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def _update_tile_edges(self):
+        """Precompute the pixel coordinate of every tile edge for the current tile size."""
+        # tile_edges[i] is the left edge of column i and the top edge of row i (the grid is square)
+        self.tile_edges = tuple(range(0, (self.grid_size + 1) * self.tile_size, self.tile_size))
+
     def setup_ui(self):
         # Main container
         main_frame = tk.Frame(self.root, bg="#2d2d2d")
@@ -448,8 +653,9 @@ class KnittingDesigner:
                 highlightbackground="#2d2d2d"
             )
             btn.pack(side=tk.LEFT, padx=(0, 5))
-            btn.bind("<Button-1>", lambda e, idx=i: self.select_color(idx))
-            btn.bind("<Button-3>", lambda e, idx=i: self.edit_color(idx))  # Right-click to edit
+            btn.color_index = i  # Read back by the shared click handlers
+            btn.bind("<Button-1>", self._on_color_click)
+            btn.bind("<Button-3>", self._on_color_right_click)  # Right-click to edit
             self.color_buttons.append(btn)
 
             # Label
@@ -474,7 +680,7 @@ class KnittingDesigner:
             highlightbackground="#2d2d2d"
         )
         self.mark_button.pack(side=tk.LEFT, padx=(0, 5))
-        self.mark_button.bind("<Button-1>", lambda e: self.toggle_mark_mode())
+        self.mark_button.bind("<Button-1>", self.toggle_mark_mode)
 
         mark_label = tk.Label(mark_frame, text="Mark", fg="#888888", bg="#2d2d2d", font=("Arial", 9))
         mark_label.pack(side=tk.LEFT)
@@ -497,7 +703,7 @@ class KnittingDesigner:
         zoom_out_btn = tk.Button(
             zoom_frame,
             text="-",
-            command=lambda: self.zoom(-1),
+            command=self.zoom_out,
             bg="#444444",
             fg="#cccccc",
             relief=tk.FLAT,
@@ -518,7 +724,7 @@ class KnittingDesigner:
         zoom_in_btn = tk.Button(
             zoom_frame,
             text="+",
-            command=lambda: self.zoom(1),
+            command=self.zoom_in,
             bg="#444444",
             fg="#cccccc",
             relief=tk.FLAT,
@@ -576,7 +782,7 @@ class KnittingDesigner:
         self.row_header_canvas.grid(row=1, column=0, sticky="ns")
 
         # Main canvas
-        canvas_size = self.grid_size * self.tile_size
+        canvas_size = self.tile_edges[-1]
         self.canvas = tk.Canvas(
             canvas_frame,
             width=min(640, canvas_size),
@@ -600,13 +806,20 @@ class KnittingDesigner:
         canvas_frame.grid_columnconfigure(1, weight=1)
 
         # Set scroll region
-        self.canvas.config(scrollregion=(0, 0, canvas_size, canvas_size))
-        self.col_header_canvas.config(scrollregion=(0, 0, canvas_size, self.header_size))
-        self.row_header_canvas.config(scrollregion=(0, 0, self.header_size, canvas_size))
+        self._update_scroll_regions()
+
+        # Tiles are rendered into a single image covering the visible cells,
+        # rather than one canvas rectangle per tile
+        self.grid_image = tk.PhotoImage()
+        self.view = None  # (min_row, min_col, max_row, max_col) of the rendered cells, exclusive max
+        self.render_scheduled = False  # Whether a re-render of the visible cells is waiting for Tk to be idle
 
         # Draw initial grid
         self.draw_grid()
 
+        # Re-render the visible cells when the canvas is resized
+        self.canvas.bind("<Configure>", self.update_view)
+
         # Bind events - Left click for painting
         self.canvas.bind("<Button-1>", self.on_canvas_click)
         self.canvas.bind("<B1-Motion>", self.on_canvas_drag)
@@ -622,43 +835,57 @@ class KnittingDesigner:
         self.canvas.bind("<Button-4>", self.on_mousewheel)    # Linux scroll up
         self.canvas.bind("<Button-5>", self.on_mousewheel)    # Linux scroll down
 
-        # Keyboard shortcuts
-        self.root.bind("<Control-z>", self.undo)
-        self.root.bind("<Control-Z>", self.undo)
-        self.root.bind("<Control-plus>", lambda e: self.zoom(1))
-        self.root.bind("<Control-equal>", lambda e: self.zoom(1))
-        self.root.bind("<Control-minus>", lambda e: self.zoom(-1))
-
-        # Copy/Cut/Paste shortcuts
-        self.root.bind("<Control-c>", self.copy_selection)
-        self.root.bind("<Control-C>", self.copy_selection)
-        self.root.bind("<Control-x>", self.cut_selection)
-        self.root.bind("<Control-X>", self.cut_selection)
-        self.root.bind("<Control-v>", self.paste_selection)
-        self.root.bind("<Control-V>", self.paste_selection)
-        self.root.bind("<Control-s>", self.save_project)
-        self.root.bind("<Control-S>", self.save_project)
+        # Keyboard shortcuts, looked up by lowercase keysym so Shift/Caps Lock don't matter
+        self.ctrl_shortcuts = {
+            "z": self.undo,
+            "plus": self.zoom_in,
+            "equal": self.zoom_in,
+            "minus": self.zoom_out,
+            "c": self.copy_selection,
+            "x": self.cut_selection,
+            "v": self.paste_selection,
+            "s": self.save_project,
+        }
+        self.root.bind("<Control-KeyPress>", self._on_ctrl_key)
         self.root.bind("<Escape>", self.clear_selection)
 
+    def _on_ctrl_key(self, event):
+        """Run the shortcut for a Ctrl+key press, if there is one."""
+        handler = self.ctrl_shortcuts.get(event.keysym.lower())
+        if handler:
+            handler(event)
+
     def _on_h_scroll(self, *args):
         """Handle horizontal scrolling - sync main canvas and column header."""
         self.canvas.xview(*args)
         self.col_header_canvas.xview(*args)
+        self.update_view()
 
     def _on_v_scroll(self, *args):
         """Handle vertical scrolling - sync main canvas and row header."""
         self.canvas.yview(*args)
         self.row_header_canvas.yview(*args)
+        self.update_view()
+
+    def _update_scroll_regions(self):
+        """Size the scroll regions of the grid and header canvases to the grid at the current tile size."""
+        canvas_size = self.tile_edges[-1]  # Far edge of the last tile
+        self.canvas.config(scrollregion=(0, 0, canvas_size, canvas_size))
+        self.col_header_canvas.config(scrollregion=(0, 0, canvas_size, self.header_size))
+        self.row_header_canvas.config(scrollregion=(0, 0, self.header_size, canvas_size))
 
     def _col_to_excel(self, col):
         """Convert column number to Excel-style letter (0=A, 25=Z, 26=AA, etc.)."""
-        result = ""
+        letters = []
         col += 1  # 1-indexed
         while col > 0:
-            col -= 1
-            result = chr(ord('A') + col % 26) + result
-            col //= 26
-        return result
+            col, letter = divmod(col - 1, 26)
+            letters.append(chr(ord('A') + letter))
+        return "".join(reversed(letters))
+
+    def _header_font(self, tile_size):
+        """Get the header font for a tile size."""
+        return ("Arial", max(6, min(10, tile_size - 2)))
 
     def draw_headers(self):
         """Draw row and column headers."""
@@ -666,20 +893,17 @@ class KnittingDesigner:
         self.col_header_canvas.delete("all")
         self.row_header_canvas.delete("all")
 
-        canvas_size = self.grid_size * self.tile_size
-
         # Update scroll regions
-        self.col_header_canvas.config(scrollregion=(0, 0, canvas_size, self.header_size))
-        self.row_header_canvas.config(scrollregion=(0, 0, self.header_size, canvas_size))
+        self._update_scroll_regions()
+
+        header_font = self._header_font(self.tile_size)
 
-        # Determine font size based on tile size
-        font_size = max(6, min(10, self.tile_size - 2))
-        header_font = ("Arial", font_size)
+        half_tile = self.tile_size // 2
+        labels = header_labels(self.grid_size)
 
         # Draw col headers (1, 2, 3, ...)
-        for col in range(self.grid_size):
-            x = col * self.tile_size + self.tile_size // 2
-            label = str(col + 1)
+        for col, label in enumerate(labels):
+            x = self.tile_edges[col] + half_tile
             self.col_header_canvas.create_text(
                 x, self.header_size // 2,
                 text=label,
@@ -688,9 +912,8 @@ class KnittingDesigner:
             )
 
         # Draw row headers (1, 2, 3, ...)
-        for row in range(self.grid_size):
-            y = row * self.tile_size + self.tile_size // 2
-            label = str(row + 1)
+        for row, label in enumerate(labels):
+            y = self.tile_edges[row] + half_tile
             self.row_header_canvas.create_text(
                 self.header_size // 2, y,
                 text=label,
@@ -702,40 +925,165 @@ class KnittingDesigner:
         """Draw the entire grid."""
         self.canvas.delete("all")
         self.selection_rect_id = None  # Reset since canvas was cleared
-        self.tile_ids = [[None for _ in range(self.grid_size)] for _ in range(self.grid_size)]
-
-        for row in range(self.grid_size):
-            for col in range(self.grid_size):
-                x1 = col * self.tile_size
-                y1 = row * self.tile_size
-                x2 = x1 + self.tile_size
-                y2 = y1 + self.tile_size
-
-                tile_id = self.canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill=self.grid_data[row][col],
-                    outline="#4a4a4a",
-                    width=1
-                )
-                self.tile_ids[row][col] = tile_id
+
+        self.grid_image_id = self.canvas.create_image(0, 0, image=self.grid_image, anchor=tk.NW)
+        self.render_view()
 
         # Draw headers
         self.draw_headers()
 
-        # Redraw marks
-        self.redraw_all_marks()
 
         # Redraw selection if active
         if self.selection_start and self.selection_end:
             self._draw_selection_rect()
 
+    def _visible_cells(self):
+        """Get the range of cells visible in the canvas (min_row, min_col, max_row, max_col), exclusive max."""
+        x1 = self.canvas.canvasx(0)
+        y1 = self.canvas.canvasy(0)
+        x2 = x1 + self.canvas.winfo_width()
+        y2 = y1 + self.canvas.winfo_height()
+
+        min_col = max(0, int(x1 // self.tile_size))
+        min_row = max(0, int(y1 // self.tile_size))
+        max_col = min(self.grid_size, int(x2 // self.tile_size) + 1)
+        max_row = min(self.grid_size, int(y2 // self.tile_size) + 1)
+        return min_row, min_col, max_row, max_col
+
+    def update_view(self, _event=None):
+        """Re-render the grid image if cells outside it have scrolled into view (after scroll or resize)."""
+        min_row, min_col, max_row, max_col = self._visible_cells()
+        if self.view is None:
+            self.render_view()
+            return
+
+        view_min_row, view_min_col, view_max_row, view_max_col = self.view
+        if (min_row < view_min_row or min_col < view_min_col
+                or max_row > view_max_row or max_col > view_max_col):
+            self.render_view()
+
+    def render_view(self):
+        """Render the visible cells, plus a margin around them, into the grid image and move it over them."""
+        min_row, min_col, max_row, max_col = self._visible_cells()
+        min_row = max(0, min_row - self.view_margin)
+        min_col = max(0, min_col - self.view_margin)
+        max_row = min(self.grid_size, max_row + self.view_margin)
+        max_col = min(self.grid_size, max_col + self.view_margin)
+        self.view = (min_row, min_col, max_row, max_col)
+
+        edges = self.tile_edges
+        self.grid_image.configure(
+            width=edges[max_col] - edges[min_col],
+            height=edges[max_row] - edges[min_row]
+        )
+        self.canvas.coords(self.grid_image_id, edges[min_col], edges[min_row])
+        self._render_cells(min_row, min_col, max_row, max_col)
+
+    def _schedule_render_view(self):
+        """Schedule re-rendering the visible cells once Tk is idle, unless already scheduled."""
+        if not self.render_scheduled:
+            self.render_scheduled = True
+            self.root.after_idle(self._flush_render_view)
+
+    def _flush_render_view(self):
+        """Re-render the visible cells as scheduled by _schedule_render_view."""
+        self.render_scheduled = False
+        self.render_view()
+
+    def _render_cells(self, min_row, min_col, max_row, max_col):
+        """Redraw a block of tiles (exclusive max) into the grid image with a single put."""
+        view_min_row, view_min_col, view_max_row, view_max_col = self.view
+        min_row = max(min_row, view_min_row)
+        min_col = max(min_col, view_min_col)
+        max_row = min(max_row, view_max_row)
+        max_col = min(max_col, view_max_col)
+        if min_row >= max_row or min_col >= max_col:
+            return  # Nothing of the block is rendered
+
+        edges = self.tile_edges
+        width = edges[max_col] - edges[min_col]
+        height = edges[max_row] - edges[min_row]
+
+        tile_rows = self.tile_rows
+        for rgb in self.palette_rgb[len(tile_rows):]:
+            tile_rows.append(GRID_LINE_RGB + rgb * (self.tile_size - 1))
+        line_row = GRID_LINE_RGB * width  # The grid line along the top of each row of tiles
+
+        # Write the block as one binary PPM so Tk decodes it in a single call.
+        # Every pixel row below the grid line of a row of unmarked tiles is the same, so each is built once and repeated.
+        data = bytearray(b"P6 %d %d 255\n" % (width, height))
+        for row_data, mark_row in zip(self.grid_data[min_row:max_row], self.marked_rows[min_row:max_row]):
+            data += line_row
+            pieces = [tile_rows[color_id] for color_id in row_data[min_col:max_col]]
+            if mark_row.find(1, min_col, max_col) < 0:
+                data += b"".join(pieces) * (self.tile_size - 1)
+                continue
+
+            # Swap in the pixel rows of the marked tiles one pixel row at a time
+            marked = [
+                (i, self._marked_tile_rows(row_data[col]))
+                for i, col in enumerate(range(min_col, max_col))
+                if mark_row[col]
+            ]
+            for y in range(1, self.tile_size):
+                for i, marked_rows in marked:
+                    pieces[i] = marked_rows[y]
+                data += b"".join(pieces)
+
+        self.grid_image.put(
+            bytes(data),
+            to=(edges[min_col] - edges[view_min_col], edges[min_row] - edges[view_min_row])
+        )
+
+    def _marked_tile_rows(self, color_id):
+        """Get the RGB bytes of each pixel row of a tile of a palette color with an X mark."""
+        marked_rows = self.marked_tile_rows.get(color_id)
+        if marked_rows is None:
+            row = GRID_LINE_RGB + self.palette_rgb[color_id] * (self.tile_size - 1)
+            marked_rows = [GRID_LINE_RGB * self.tile_size]
+            for cols in mark_pixels(self.tile_size)[1:]:
+                marked_row = bytearray(row)
+                for x in cols:
+                    marked_row[3 * x:3 * x + 3] = MARK_RGB
+                marked_rows.append(bytes(marked_row))
+            self.marked_tile_rows[color_id] = marked_rows
+        return marked_rows
+
+    def _copy_tile_image(self, color_id, x1, y1, x2, y2, marked=False):
+        """Fill a region of the grid image with copies of a one-tile image of a palette color."""
+        if marked:
+            tile_image = self.marked_tile_images.get(color_id)
+            if tile_image is None:
+                tile_image = tk.PhotoImage(width=self.tile_size, height=self.tile_size)
+                header = b"P6 %d %d 255\n" % (self.tile_size, self.tile_size)
+                tile_image.put(header + b"".join(self._marked_tile_rows(color_id)), to=(0, 0))
+                self.marked_tile_images[color_id] = tile_image
+        else:
+            tile_image = self.tile_images.get(color_id)
+            if tile_image is None:
+                tile_image = tk.PhotoImage(width=self.tile_size, height=self.tile_size)
+                header = b"P6 %d %d 255\n" % (self.tile_size, self.tile_size)
+                body_row = GRID_LINE_RGB + self.palette_rgb[color_id] * (self.tile_size - 1)
+                tile_image.put(header + GRID_LINE_RGB * self.tile_size + body_row * (self.tile_size - 1), to=(0, 0))
+                self.tile_images[color_id] = tile_image
+        # Tk repeats the source image when the target region is larger than it
+        self.grid_image.tk.call(self.grid_image, "copy", tile_image, "-to", x1, y1, x2, y2)
+
+    def _on_color_click(self, event):
+        """Select the color of the clicked color button."""
+        self.select_color(event.widget.color_index)
+
+    def _on_color_right_click(self, event):
+        """Edit the color of the right-clicked color button."""
+        self.edit_color(event.widget.color_index)
+
     def select_color(self, index):
         """Select a color for painting."""
         self.selected_color_index = index
         self.mark_mode = False
         self.update_color_selection()
 
-    def toggle_mark_mode(self):
+    def toggle_mark_mode(self, _event=None):
         """Toggle mark mode for tracking completed stitches."""
         self.mark_mode = True
         self.selected_color_index = -1  # Deselect color
@@ -747,25 +1095,31 @@ class KnittingDesigner:
             self.root,
             initial_color=self.colors[index],
             title=f"Choose Color {index + 1}",
-            recent_colors=self.recent_colors
+            recent_colors=list(self.recent_colors)
         )
         if color:
+            try:
+                color_id = self._color_id(color)
+            except ValueError:
+                return  # Palette is full; keep the slot's current color
             self.colors[index] = color
+            self.color_ids[index] = color_id
             self.color_buttons[index].configure(bg=color)
             # Add to recent colors
             if color in self.recent_colors:
                 self.recent_colors.remove(color)
-            self.recent_colors.insert(0, color)
-            self.recent_colors = self.recent_colors[:self.max_recent_colors]
+            self.recent_colors.appendleft(color)  # The oldest color drops off once full
             self.save_settings()
 
     def update_color_selection(self):
         """Update visual indication of selected color."""
-        for i, btn in enumerate(self.color_buttons):
-            if i == self.selected_color_index:
-                btn.configure(highlightbackground="#ffffff", highlightthickness=3)
-            else:
-                btn.configure(highlightbackground="#2d2d2d", highlightthickness=2)
+        # Only the previously and newly selected buttons need to change
+        if self.highlighted_index != self.selected_color_index:
+            if self.highlighted_index >= 0:
+                self.color_buttons[self.highlighted_index].configure(highlightbackground="#2d2d2d", highlightthickness=2)
+            if self.selected_color_index >= 0:
+                self.color_buttons[self.selected_color_index].configure(highlightbackground="#ffffff", highlightthickness=3)
+            self.highlighted_index = self.selected_color_index
 
         # Update mark button highlight
         if self.mark_mode:
@@ -775,77 +1129,128 @@ class KnittingDesigner:
 
     def get_tile_at(self, event):
         """Get tile coordinates from canvas event."""
-        # Convert to canvas coordinates
-        canvas_x = self.canvas.canvasx(event.x)
-        canvas_y = self.canvas.canvasy(event.y)
-
-        col = int(canvas_x // self.tile_size)
-        row = int(canvas_y // self.tile_size)
+        # Convert to canvas coordinates, then to tiles with one floor division each
+        tile_size = self.tile_size
+        col = int(self.canvas.canvasx(event.x) // tile_size)
+        row = int(self.canvas.canvasy(event.y) // tile_size)
 
-        if 0 <= row < self.grid_size and 0 <= col < self.grid_size:
+        grid_size = self.grid_size
+        if 0 <= row < grid_size and 0 <= col < grid_size:
             return row, col
         return None
 
+    def _color_id(self, color):
+        """Get the palette id of a color, adding it to the palette if needed."""
+        color_id = self.palette_ids.get(color)
+        if color_id is None:
+            # Check the color before touching the palette, so a bad color leaves it unchanged
+            rgb = bytes.fromhex(color[1:]) if color[:1] == "#" else b""
+            if len(rgb) != 3:
+                raise ValueError(f"Not a #rrggbb color: {color!r}")
+            color_id = len(self.palette)
+            if color_id >= MAX_PALETTE_SIZE:
+                raise ValueError(f"Palette is full ({MAX_PALETTE_SIZE} colors); cannot add {color}")
+            self.palette.append(color)
+            self.palette_ids[color] = color_id
+            self.palette_rgb.append(rgb)
+        return color_id
+
+    def _update_color_ids(self):
+        """Look up the palette id of every color slot."""
+        self.color_ids = [self._color_id(color) for color in self.colors]
+
     def paint_tile(self, row, col, record_undo=True):
         """Paint a tile with the selected color."""
-        color = self.colors[self.selected_color_index]
-        old_color = self.grid_data[row][col]
+        color_id = self.color_ids[self.selected_color_index]
+        old_id = self.grid_data[row][col]
 
-        if old_color == color:
+        if old_id == color_id:
             return  # No change needed
 
         if record_undo:
-            self.current_stroke.append((row, col, old_color))
-
-        self.grid_data[row][col] = color
-        self.canvas.itemconfig(self.tile_ids[row][col], fill=color)
+            # Only the first old color of a tile is needed to undo the stroke
+            self.current_stroke.setdefault((row, col), old_id)
+
+        self.grid_data[row][col] = color_id
+        self._queue_tile(row, col)
+
+    def _queue_tile(self, row, col):
+        """Queue a tile to be drawn on the next idle flush, so a burst of drag events is drawn once."""
+        self.pending_tiles.add((row, col))
+        self._schedule_flush()
+
+    def _mark_dirty(self, min_row, min_col, max_row, max_col):
+        """Queue a block of tiles (exclusive max) to be redrawn as one block on the next idle flush."""
+        if self.dirty_block:
+            dirty_min_row, dirty_min_col, dirty_max_row, dirty_max_col = self.dirty_block
+            min_row = min(min_row, dirty_min_row)
+            min_col = min(min_col, dirty_min_col)
+            max_row = max(max_row, dirty_max_row)
+            max_col = max(max_col, dirty_max_col)
+        self.dirty_block = (min_row, min_col, max_row, max_col)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Schedule drawing the queued changes once Tk is idle, unless already scheduled."""
+        self.project_dirty = True  # Every change to tiles or marks is drawn through here
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.root.after_idle(self._flush_tiles)
+
+    def _flush_tiles(self):
+        """Draw all queued changes into the grid image, as one block or one copy per run of equal tiles."""
+        self.flush_scheduled = False
+        pending = sorted(self.pending_tiles)
+        self.pending_tiles = set()
+
+        dirty_block = self.dirty_block
+        self.dirty_block = None
+        if dirty_block:
+            self._render_cells(*dirty_block)
+            dirty_min_row, dirty_min_col, dirty_max_row, dirty_max_col = dirty_block
+        else:
+            dirty_min_row = dirty_min_col = dirty_max_row = dirty_max_col = 0
+
+        min_row, min_col, max_row, max_col = self.view
+        runs = []  # [row, first_col, last_col, color_id, marked]
+        tile_count = 0
+        for row, col in pending:
+            if not (min_row <= row < max_row and min_col <= col < max_col):
+                continue  # Drawn when scrolled into view
+            if dirty_min_row <= row < dirty_max_row and dirty_min_col <= col < dirty_max_col:
+                continue  # Already drawn with the block
+            tile_count += 1
+            color_id = self.grid_data[row][col]
+            marked = self.marked_rows[row][col]
+            run = runs[-1] if runs else None
+            if run and run[0] == row and run[2] == col - 1 and run[3] == color_id and run[4] == marked:
+                run[2] = col
+            else:
+                runs.append([row, col, col, color_id, marked])
+
+        if len(runs) > 1:
+            # A single put of the bounding block is cheaper than many copies, as long as at
+            # least half of the block actually changed
+            first_col = min(run[1] for run in runs)
+            last_col = max(run[2] for run in runs)
+            block_size = (runs[-1][0] - runs[0][0] + 1) * (last_col - first_col + 1)
+            if block_size <= 2 * tile_count:
+                self._render_cells(runs[0][0], first_col, runs[-1][0] + 1, last_col + 1)
+                return
+
+        edges = self.tile_edges
+        for row, first_col, last_col, color_id, marked in runs:
+            self._copy_tile_image(
+                color_id,
+                edges[first_col] - edges[min_col], edges[row] - edges[min_row],
+                edges[last_col + 1] - edges[min_col], edges[row + 1] - edges[min_row],
+                marked
+            )
 
     def toggle_mark(self, row, col):
         """Toggle the X mark on a tile."""
-        if (row, col) in self.marked_tiles:
-            # Remove mark
-            self.marked_tiles.discard((row, col))
-            if (row, col) in self.mark_ids:
-                for item_id in self.mark_ids[(row, col)]:
-                    self.canvas.delete(item_id)
-                del self.mark_ids[(row, col)]
-        else:
-            # Add mark
-            self.marked_tiles.add((row, col))
-            self.draw_mark(row, col)
-
-    def draw_mark(self, row, col):
-        """Draw an X mark on the specified tile."""
-        x1 = col * self.tile_size
-        y1 = row * self.tile_size
-        x2 = x1 + self.tile_size
-        y2 = y1 + self.tile_size
-
-        # Padding from edges
-        padding = max(2, self.tile_size // 6)
-
-        # Draw X with two lines
-        line1 = self.canvas.create_line(
-            x1 + padding, y1 + padding,
-            x2 - padding, y2 - padding,
-            fill="#ff0000", width=max(2, self.tile_size // 20), tags="mark"
-        )
-        line2 = self.canvas.create_line(
-            x2 - padding, y1 + padding,
-            x1 + padding, y2 - padding,
-            fill="#ff0000", width=max(2, self.tile_size // 20), tags="mark"
-        )
-        self.mark_ids[(row, col)] = [line1, line2]
-
-    def redraw_all_marks(self):
-        """Redraw all X marks (called after zoom or grid redraw)."""
-        # Clear existing mark canvas items
-        self.canvas.delete("mark")
-        self.mark_ids.clear()
-
-        # Redraw all marks
-        for row, col in self.marked_tiles:
-            self.draw_mark(row, col)
+        self.marked_rows[row][col] ^= 1
+        self._queue_tile(row, col)
 
     def on_canvas_click(self, event):
         """Handle canvas click."""
@@ -856,11 +1261,13 @@ class KnittingDesigner:
         if self.mark_mode:
             self.is_dragging = True
             # Determine if we're adding or removing marks based on first tile
-            self.mark_adding = (pos[0], pos[1]) not in self.marked_tiles
+            self.mark_adding = not self.marked_rows[pos[0]][pos[1]]
+            self.last_tile = pos
             self.toggle_mark(*pos)
         else:
             self.is_dragging = True
-            self.current_stroke = []
+            self._end_stroke()  # In case the release of the last stroke was missed
+            self.last_tile = pos
             self.paint_tile(*pos)
 
     def on_canvas_drag(self, event):
@@ -868,27 +1275,111 @@ class KnittingDesigner:
         if not self.is_dragging:
             return
         pos = self.get_tile_at(event)
-        if not pos:
+        if not pos or pos == (self.drag_tile or self.last_tile):
+            return  # Most motion events stay within the tile already painted or queued
+
+        # Only the latest position matters: motion events can arrive faster than they are handled
+        self.drag_tile = pos
+        if self.drag_flush_id is None:
+            self.drag_flush_id = self.root.after_idle(self._flush_drag)
+
+    def _flush_drag(self):
+        """Paint or mark up to the latest tile dragged over."""
+        self.drag_flush_id = None
+        pos = self.drag_tile
+        self.drag_tile = None
+        if pos is None or not self.is_dragging:
             return
 
+        # Fill in the tiles skipped since the last handled position
+        line = self._line_tiles(self.last_tile, pos)
+        self.last_tile = pos
         if self.mark_mode:
-            # Add or remove marks based on initial click action
-            is_marked = (pos[0], pos[1]) in self.marked_tiles
-            if self.mark_adding and not is_marked:
-                self.toggle_mark(*pos)
-            elif not self.mark_adding and is_marked:
-                self.toggle_mark(*pos)
+            self._mark_line(line)
         else:
-            self.paint_tile(*pos)
+            self._paint_line(line)
+
+    def _mark_line(self, tiles):
+        """Add or remove the X mark on a run of dragged-over tiles, following the initial click."""
+        # Adding and removing are the same write: set each tile's mask byte to the wanted value
+        marked = int(self.mark_adding)
+        marked_rows = self.marked_rows
+        changed = []
+        for row, col in tiles:
+            mark_row = marked_rows[row]
+            if mark_row[col] != marked:
+                mark_row[col] = marked
+                changed.append((row, col))
+
+        if changed:
+            self.pending_tiles.update(changed)
+            self._schedule_flush()
+
+    def _paint_line(self, tiles):
+        """Paint a run of dragged-over tiles with the selected color in one pass."""
+        # The hot loop of a stroke: lookups are hoisted out and the tiles are queued together.
+        # A tile painted earlier in the stroke already has the color, so it is skipped here too.
+        color_id = self.color_ids[self.selected_color_index]
+        grid_data = self.grid_data
+        stroke = self.current_stroke
+        changed = []
+        for row, col in tiles:
+            row_data = grid_data[row]
+            old_id = row_data[col]
+            if old_id != color_id:
+                stroke[row, col] = old_id
+                row_data[col] = color_id
+                changed.append((row, col))
+
+        if changed:
+            self.pending_tiles.update(changed)
+            self._schedule_flush()
+
+    @staticmethod
+    def _line_tiles(start, end):
+        """Yield the tiles on a straight line from start to end (Bresenham), excluding start."""
+        row, col = start
+        end_row, end_col = end
+        d_row = abs(end_row - row)
+        d_col = -abs(end_col - col)
+        step_row = 1 if row < end_row else -1
+        step_col = 1 if col < end_col else -1
+        error = d_row + d_col
+
+        while row != end_row or col != end_col:
+            double_error = 2 * error
+            if double_error >= d_col:
+                error += d_col
+                row += step_row
+            if double_error <= d_row:
+                error += d_row
+                col += step_col
+            yield row, col
 
     def on_canvas_release(self, event):
         """Handle mouse release."""
+        if self.drag_flush_id is not None:
+            self.root.after_cancel(self.drag_flush_id)
+            self._flush_drag()
         self.is_dragging = False
-        if self.current_stroke:
-            self.undo_history.append(self.current_stroke)
-            if len(self.undo_history) > self.max_undo:
-                self.undo_history.pop(0)
-        self.current_stroke = []
+        self._end_stroke()
+
+    def _end_stroke(self):
+        """Push the tiles painted so far in the current stroke onto the undo history."""
+        # Undo entries restore whole blocks, so a stroke in progress must be on the history
+        # before anything else is recorded or undone
+        stroke = self.current_stroke
+        if stroke:
+            # Snapshot the block the stroke touched as it was before the stroke
+            rows = [row for row, _ in stroke]
+            cols = [col for _, col in stroke]
+            min_row, min_col = min(rows), min(cols)
+            max_col = max(cols) + 1
+            block = [row_data[min_col:max_col] for row_data in self.grid_data[min_row:max(rows) + 1]]
+            for (row, col), old_id in stroke.items():
+                block[row - min_row][col - min_col] = old_id
+            self.undo_history.append((min_row, min_col, block))
+        self.current_stroke = {}
 
     def on_mousewheel(self, event):
         """Handle mouse wheel for zooming."""
@@ -898,6 +1389,14 @@ class KnittingDesigner:
         elif event.num == 5 or (hasattr(event, 'delta') and event.delta < 0):
             self.zoom(-1)
 
+    def zoom_in(self, _event=None):
+        """Zoom in one step."""
+        self.zoom(1)
+
+    def zoom_out(self, _event=None):
+        """Zoom out one step."""
+        self.zoom(-1)
+
     def zoom(self, direction):
         """Zoom in or out."""
         old_size = self.tile_size
@@ -907,36 +1406,63 @@ class KnittingDesigner:
             self.tile_size = max(self.tile_size - 1, self.min_tile_size)
 
         if self.tile_size != old_size:
+            self._update_tile_edges()
+            self.tile_images.clear()
+            self.tile_rows.clear()
+            self.marked_tile_rows.clear()
+            self.marked_tile_images.clear()
+
             # Update zoom label
             zoom_percent = int((self.tile_size / 5) * 100)
             self.zoom_label.config(text=f"{zoom_percent}%")
 
-            # Redraw grid (includes headers)
-            self.draw_grid()
-
             # Update scroll region
-            canvas_size = self.grid_size * self.tile_size
-            self.canvas.config(scrollregion=(0, 0, canvas_size, canvas_size))
-            self.col_header_canvas.config(scrollregion=(0, 0, canvas_size, self.header_size))
-            self.row_header_canvas.config(scrollregion=(0, 0, self.header_size, canvas_size))
+            self._update_scroll_regions()
+
+            # Headers only move along their own axis; the font only changes at small tile sizes
+            ratio = self.tile_size / old_size
+            self.col_header_canvas.scale("all", 0, 0, ratio, 1)
+            self.row_header_canvas.scale("all", 0, 0, 1, ratio)
+            header_font = self._header_font(self.tile_size)
+            if header_font != self._header_font(old_size):
+                self.col_header_canvas.itemconfig("all", font=header_font)
+                self.row_header_canvas.itemconfig("all", font=header_font)
+
+            # Re-render the tiles for the new visible cells, once for a fast run of zoom steps
+            self._schedule_render_view()
+
+            if self.selection_start and self.selection_end:
+                self._draw_selection_rect()
 
     def undo(self, _event=None):
         """Undo the last stroke."""
+        self._end_stroke()
         if not self.undo_history:
             return
 
-        stroke = self.undo_history.pop()
-        for row, col, old_color in stroke:
-            self.grid_data[row][col] = old_color
-            self.canvas.itemconfig(self.tile_ids[row][col], fill=old_color)
+        min_row, min_col, block = self.undo_history.pop()
+        self._write_block(min_row, min_col, block)
+
+    def _write_block(self, min_row, min_col, block):
+        """Write rows of palette ids into the grid at (min_row, min_col) and redraw them as one block."""
+        max_col = min_col + len(block[0])
+        for row_data, old_row in zip(self.grid_data[min_row:], block):
+            row_data[min_col:max_col] = old_row
+        self._mark_dirty(min_row, min_col, min_row + len(block), max_col)
 
     def clear_grid(self):
         """Clear the entire grid to default color."""
-        default_color = "#f5f5f5"
-        for row in range(self.grid_size):
-            for col in range(self.grid_size):
-                self.grid_data[row][col] = default_color
-                self.canvas.itemconfig(self.tile_ids[row][col], fill=default_color)
+        self._end_stroke()
+        blank = array("H", [0]) * self.grid_size
+        # Undo snapshots restore whole blocks, so the clear is recorded too; otherwise undoing an
+        # older stroke would bring back cleared tiles around it
+        old_rows = [row_data[:] for row_data in self.grid_data]
+        if all(row_data == blank for row_data in old_rows):
+            return  # Already clear
+        self.undo_history.append((0, 0, old_rows))
+        for row_data in self.grid_data:
+            row_data[:] = blank
+        self._mark_dirty(0, 0, self.grid_size, self.grid_size)
 
     # Selection methods
     def on_selection_start(self, event):
@@ -953,9 +1479,22 @@ class KnittingDesigner:
             return
 
         pos = self.get_tile_at(event)
-        if pos:
+        if pos and pos != self.selection_end:  # Most motion events stay within the same tile
             self.selection_end = pos
-            self._draw_selection_rect()
+            # Redraw at most about 60 times a second, however fast the pointer reports motion
+            if self.selection_redraw_id is None:
+                self.selection_redraw_id = self.root.after(16, self._redraw_selection)
+
+    def _redraw_selection(self):
+        """Draw the selection as of the latest drag event."""
+        self.selection_redraw_id = None
+        self._draw_selection_rect()
+
+    def _cancel_selection_redraw(self):
+        """Drop a pending throttled selection redraw."""
+        if self.selection_redraw_id is not None:
+            self.root.after_cancel(self.selection_redraw_id)
+            self.selection_redraw_id = None
 
     def on_selection_end(self, event):
         """Finalize selection on mouse release."""
@@ -963,19 +1502,17 @@ class KnittingDesigner:
             return
 
         self.is_selecting = False
+        self._cancel_selection_redraw()
         pos = self.get_tile_at(event)
         if pos:
             self.selection_end = pos
-            self._draw_selection_rect()
+        self._draw_selection_rect()
 
     def _draw_selection_rect(self):
         """Draw or update the selection rectangle."""
-        if self.selection_rect_id:
-            for rect_id in self.selection_rect_id:
-                self.canvas.delete(rect_id)
-            self.selection_rect_id = None
-
         if not self.selection_start or not self.selection_end:
+            self.canvas.delete("selection")
+            self.selection_rect_id = None
             return
 
         # Get normalized bounds
@@ -985,31 +1522,38 @@ class KnittingDesigner:
         min_col, max_col = min(c1, c2), max(c1, c2)
 
         # Calculate pixel coordinates
-        x1 = min_col * self.tile_size
-        y1 = min_row * self.tile_size
-        x2 = (max_col + 1) * self.tile_size
-        y2 = (max_row + 1) * self.tile_size
+        x1 = self.tile_edges[min_col]
+        y1 = self.tile_edges[min_row]
+        x2 = self.tile_edges[max_col + 1]
+        y2 = self.tile_edges[max_row + 1]
+
+        if self.selection_rect_id:
+            # Move the existing rectangles rather than recreating them on every drag event
+            outer, main, inner = self.selection_rect_id
+            self.canvas.coords(outer, x1 - 1, y1 - 1, x2 + 1, y2 + 1)
+            self.canvas.coords(main, x1, y1, x2, y2)
+            self.canvas.coords(inner, x1, y1, x2, y2)
+            return
 
         # Draw selection rectangle with thick, visible border
         # Create multiple rectangles for a "marching ants" style effect
-        self.selection_rect_id = []
 
         # Outer glow/shadow (dark)
         outer = self.canvas.create_rectangle(
             x1 - 1, y1 - 1, x2 + 1, y2 + 1,
             outline="#000000",
-            width=3
+            width=3,
+            tags="selection"
         )
-        self.selection_rect_id.append(outer)
 
         # Main selection rectangle (bright cyan, thick)
         main = self.canvas.create_rectangle(
             x1, y1, x2, y2,
             outline="#00ffff",
             width=4,
-            dash=(8, 4)
+            dash=(8, 4),
+            tags="selection"
         )
-        self.selection_rect_id.append(main)
 
         # Inner highlight (white dashed, offset)
         inner = self.canvas.create_rectangle(
@@ -1017,16 +1561,16 @@ class KnittingDesigner:
             outline="#ffffff",
             width=2,
             dash=(4, 8),
-            dashoffset=6
+            dashoffset=6,
+            tags="selection"
         )
-        self.selection_rect_id.append(inner)
+        self.selection_rect_id = (outer, main, inner)
 
     def clear_selection(self, _event=None):
         """Clear the current selection."""
-        if self.selection_rect_id:
-            for rect_id in self.selection_rect_id:
-                self.canvas.delete(rect_id)
-            self.selection_rect_id = None
+        self._cancel_selection_redraw()
+        self.canvas.delete("selection")
+        self.selection_rect_id = None
         self.selection_start = None
         self.selection_end = None
         self.is_selecting = False
@@ -1048,13 +1592,10 @@ class KnittingDesigner:
 
         min_row, min_col, max_row, max_col = bounds
 
-        # Copy colors from selection to clipboard
-        self.clipboard = []
-        for row in range(min_row, max_row + 1):
-            row_data = []
-            for col in range(min_col, max_col + 1):
-                row_data.append(self.grid_data[row][col])
-            self.clipboard.append(row_data)
+        # Copy palette ids from selection to clipboard
+        self.clipboard = [
+            row_data[min_col:max_col + 1] for row_data in self.grid_data[min_row:max_row + 1]
+        ]
 
     def cut_selection(self, _event=None):
         """Cut the selected region (copy + clear)."""
@@ -1064,26 +1605,19 @@ class KnittingDesigner:
 
         # First copy
         self.copy_selection()
+        self._end_stroke()
 
         min_row, min_col, max_row, max_col = bounds
 
-        # Record for undo
-        undo_data = []
-        default_color = "#f5f5f5"
-
-        # Clear the selection area
-        for row in range(min_row, max_row + 1):
-            for col in range(min_col, max_col + 1):
-                old_color = self.grid_data[row][col]
-                if old_color != default_color:
-                    undo_data.append((row, col, old_color))
-                    self.grid_data[row][col] = default_color
-                    self.canvas.itemconfig(self.tile_ids[row][col], fill=default_color)
+        # Clear the selection area one row slice at a time
+        blank = array("H", [0]) * (max_col - min_col + 1)
+        old_rows = [row_data[min_col:max_col + 1] for row_data in self.grid_data[min_row:max_row + 1]]
+        if all(old_row == blank for old_row in old_rows):
+            return  # Nothing to clear
 
-        if undo_data:
-            self.undo_history.append(undo_data)
-            if len(self.undo_history) > self.max_undo:
-                self.undo_history.pop(0)
+        # Record the selection as it was for undo
+        self.undo_history.append((min_row, min_col, old_rows))
+        self._write_block(min_row, min_col, [blank] * len(old_rows))
 
     def paste_selection(self, _event=None):
         """Paste clipboard content at current selection start."""
@@ -1096,27 +1630,17 @@ class KnittingDesigner:
         else:
             start_row, start_col = 0, 0
 
-        # Record for undo
-        undo_data = []
+        self._end_stroke()
 
-        # Paste the clipboard data
-        for row_offset, row_data in enumerate(self.clipboard):
-            for col_offset, color in enumerate(row_data):
-                target_row = start_row + row_offset
-                target_col = start_col + col_offset
-
-                # Check bounds
-                if 0 <= target_row < self.grid_size and 0 <= target_col < self.grid_size:
-                    old_color = self.grid_data[target_row][target_col]
-                    if old_color != color:
-                        undo_data.append((target_row, target_col, old_color))
-                        self.grid_data[target_row][target_col] = color
-                        self.canvas.itemconfig(self.tile_ids[target_row][target_col], fill=color)
-
-        if undo_data:
-            self.undo_history.append(undo_data)
-            if len(self.undo_history) > self.max_undo:
-                self.undo_history.pop(0)
+        # Paste the clipboard data one row slice at a time, clipped to the grid
+        end_col = min(start_col + len(self.clipboard[0]), self.grid_size)
+        width = end_col - start_col
+        new_rows = [clip_row[:width] for clip_row in self.clipboard[:self.grid_size - start_row]]
+        old_rows = [row_data[start_col:end_col] for row_data in self.grid_data[start_row:start_row + len(new_rows)]]
+        if old_rows != new_rows:
+            # Record the pasted-over area as it was for undo
+            self.undo_history.append((start_row, start_col, old_rows))
+            self._write_block(start_row, start_col, new_rows)
 
         # Update selection to show pasted area
         if self.selection_start:
@@ -1129,71 +1653,141 @@ class KnittingDesigner:
             self._draw_selection_rect()
 
     def save_settings(self):
-        """Save color presets to file."""
+        """Save color presets to file, half a second after the last change."""
+        if self.save_settings_id is not None:
+            self.root.after_cancel(self.save_settings_id)
+        self.save_settings_id = self.root.after(500, self._write_settings)
+
+    def _write_settings(self):
+        """Write color presets to file."""
+        self.save_settings_id = None
         settings = {
             "colors": self.colors,
-            "recent_colors": self.recent_colors
+            "recent_colors": list(self.recent_colors)
         }
-        settings_path = os.path.join(os.path.dirname(__file__), "knitting_settings.json")
+        temp_path = SETTINGS_PATH.with_suffix(".json.tmp")
         try:
-            with open(settings_path, "w") as f:
-                json.dump(settings, f)
+            # Write a temporary file first so an interrupted write never leaves a truncated file
+            temp_path.write_bytes(dump_json(settings))
+            temp_path.replace(SETTINGS_PATH)
         except Exception:
             pass
 
     def load_settings(self):
         """Load color presets from file."""
-        settings_path = os.path.join(os.path.dirname(__file__), "knitting_settings.json")
         try:
-            with open(settings_path, "r") as f:
-                settings = json.load(f)
-                if "colors" in settings:
-                    self.colors = settings["colors"][:self.max_colors]
-                    # Pad if needed
-                    while len(self.colors) < self.max_colors:
-                        self.colors.append("#ffffff")
-                    # Update buttons
-                    for i, btn in enumerate(self.color_buttons):
-                        btn.configure(bg=self.colors[i])
-                if "recent_colors" in settings:
-                    self.recent_colors = settings["recent_colors"][:self.max_recent_colors]
+            settings = load_json(SETTINGS_PATH.read_bytes())
+            if "colors" in settings:
+                colors = settings["colors"][:self.max_colors]
+                # Pad if needed
+                while len(colors) < self.max_colors:
+                    colors.append("#ffffff")
+                # Look up every id before replacing anything, so a bad color keeps the current presets
+                color_ids = [self._color_id(color) for color in colors]
+                self.colors = colors
+                self.color_ids = color_ids
+                # Update buttons
+                for i, btn in enumerate(self.color_buttons):
+                    btn.configure(bg=self.colors[i])
+            if "recent_colors" in settings:
+                self.recent_colors = deque(
+                    settings["recent_colors"][:self.max_recent_colors], maxlen=self.max_recent_colors
+                )
         except Exception:
             pass
 
     def save_project(self, _event=None):
         """Save the current project (grid data and marks) to file."""
+        if not self.project_dirty and self._project_file_stamp() == self.project_file_stamp:
+            return  # The file already holds this project and was not deleted or replaced since
+        # The grid is stored as its compressed little-endian palette ids, alongside the palette,
+        # and the marks as the compressed mark bytes of every row.
+        # Only colors still on the grid are saved, renumbered in palette order.
+        used_ids = sorted(set().union(*self.grid_data))
+        saved_ids = [0] * len(self.palette)
+        for saved_id, color_id in enumerate(used_ids):
+            saved_ids[color_id] = saved_id
+        grid = array("H")
+        for row_data in self.grid_data:
+            grid.extend([saved_ids[color_id] for color_id in row_data])
+        if sys.byteorder == "big":
+            grid.byteswap()
         project = {
             "grid_size": self.grid_size,
-            "grid_data": self.grid_data,
-            "marked_tiles": list(self.marked_tiles)  # Convert set to list for JSON
+            "palette": [self.palette[color_id] for color_id in used_ids],
+            "grid_zlib": pack_bytes(grid.tobytes()),
+            "marks_zlib": pack_bytes(b"".join(self.marked_rows))
         }
-        project_path = os.path.join(os.path.dirname(__file__), "knitting_project.json")
         try:
-            with open(project_path, "w") as f:
-                json.dump(project, f)
+            PROJECT_PATH.write_bytes(dump_json(project))
+            self.project_dirty = False
+            self.project_file_stamp = self._project_file_stamp()
         except Exception:
             pass
 
+    @staticmethod
+    def _project_file_stamp():
+        """Get the (mtime_ns, size) of the project file, or None if it does not exist."""
+        try:
+            stat = PROJECT_PATH.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def load_project(self):
         """Load the project (grid data and marks) from file."""
-        project_path = os.path.join(os.path.dirname(__file__), "knitting_project.json")
         try:
-            with open(project_path, "r") as f:
-                project = json.load(f)
-                if "grid_data" in project:
-                    loaded_grid = project["grid_data"]
-                    # Copy data, respecting current grid size
-                    for row in range(min(len(loaded_grid), self.grid_size)):
-                        for col in range(min(len(loaded_grid[row]), self.grid_size)):
-                            self.grid_data[row][col] = loaded_grid[row][col]
-                if "marked_tiles" in project:
-                    # Convert list back to set of tuples
-                    self.marked_tiles = set(tuple(tile) for tile in project["marked_tiles"])
-                # Redraw grid with loaded data
-                self.draw_grid()
+            project = load_json(PROJECT_PATH.read_bytes())
+            loaded_size = project.get("grid_size", self.grid_size)
+            width = min(loaded_size, self.grid_size)
+            if "grid_zlib" in project or "grid" in project:
+                ids = [self._color_id(color) for color in project["palette"]]
+                grid = array("H")
+                if "grid_zlib" in project:
+                    grid.frombytes(unpack_bytes(project["grid_zlib"]))
+                else:
+                    # Projects saved before compression store the ids as plain base64
+                    grid.frombytes(base64.b64decode(project["grid"]))
+                if sys.byteorder == "big":
+                    grid.byteswap()
+                # Copy data, respecting current grid size
+                for row in range(min(len(grid) // loaded_size, self.grid_size)):
+                    start = row * loaded_size
+                    self.grid_data[row][:width] = array("H", [ids[i] for i in grid[start:start + width]])
+            elif "grid_data" in project:
+                # Projects saved before the compact format store a hex color per tile
+                loaded_grid = project["grid_data"]
+                # Copy data, respecting current grid size
+                for row in range(min(len(loaded_grid), self.grid_size)):
+                    for col in range(min(len(loaded_grid[row]), self.grid_size)):
+                        self.grid_data[row][col] = self._color_id(loaded_grid[row][col])
+            if "marks_zlib" in project:
+                self.marked_rows = [bytearray(self.grid_size) for _ in range(self.grid_size)]
+                marks = unpack_bytes(project["marks_zlib"])
+                # Copy marks, respecting current grid size
+                for row in range(min(len(marks) // loaded_size, self.grid_size)):
+                    start = row * loaded_size
+                    self.marked_rows[row][:width] = marks[start:start + width]
+            elif "marked_tiles" in project:
+                # Projects saved before compression list the marked tiles
+                self.marked_rows = [bytearray(self.grid_size) for _ in range(self.grid_size)]
+                for row, col in project["marked_tiles"]:
+                    if row < self.grid_size and col < self.grid_size:
+                        self.marked_rows[row][col] = 1
+            # Redraw tiles and marks with loaded data; headers are unchanged
+            self.render_view()
+            self.project_dirty = False
+            self.project_file_stamp = self._project_file_stamp()
         except Exception:
             pass
 
+    def on_close(self):
+        """Write any pending settings, then close the window."""
+        if self.save_settings_id is not None:
+            self.root.after_cancel(self.save_settings_id)
+            self._write_settings()
+        self.root.destroy()
+
 
 def main():
     root = tk.Tk()